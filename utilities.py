@@ -2,7 +2,7 @@ import numpy as np
 from scipy.constants import G
 from warnings import warn as raise_warning
 import pandas as pd
-from typing import Union, List
+from typing import Union, List, NamedTuple
 from scipy.integrate import solve_ivp
 from style_components.matplotlib_style import *
 import pickle
@@ -10,25 +10,48 @@ from style_components.voxel_plotter import plot_3d_voxels
 from matplotlib.ticker import FuncFormatter
 import datetime
 import time
+import functools
+import math
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional. Without it, the kernels decorated with `njit` below run as plain python functions.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 AU = 1.496e11
 LU = 384.4e6  # 'Lunar unit', the approximate distance between earth and earth's moon
 SLU = LU/20  # 'Sublunar unit', a twentieth of a lunar unit
 
+# Fraction f of the hill-radius after which a body of the given hierarchy number escapes its primary, see
+# `get_critical_semi_major_axis`.
+_CRIT_F = {3: 0.4, 4: 0.33}
+
+# Seconds per year, million years and billion years, see `turn_seconds_to_years`
+_SEC_PER_YEAR = 31_536_000.0
+_SEC_PER_MYR = 3.1536e13
+_SEC_PER_GYR = 3.1536e16
+_SEC_PER_UNIT = {"Vanilla": _SEC_PER_YEAR, "Millions": _SEC_PER_MYR, "Billions": _SEC_PER_GYR}
+
 # TEST
 # t_final = 3597776267807147
 # extended_time_points = np.linspace(0, t_final * 1.5, 1000)
 # analytical_values_extended = calc(extended_time_points)
 
 __all__ = ['check_if_direct_orbits', 'keplers_law_n_from_a', 'keplers_law_a_from_n', 'keplers_law_n_from_a_simple',
-           'get_standard_grav_parameter', 'get_hill_radius_relevant_to_body', 'get_critical_semi_major_axis',
-           'get_roche_limit', 'analytical_lifetime_one_tide', 'dont', 'get_solar_system_bodies_data',
-           'CelestialBody', 'turn_seconds_to_years', 'get_a_derivative_factors_experimental', 'get_a_factors',
-           'get_omega_derivative_factors_experimental', 'get_omega_factors', 'unpack_solve_ivp_object',
-           'turn_billion_years_into_seconds', 'bind_system_gravitationally', 'state_vector_plot',
-           'submoon_system_derivative', 'update_values', 'track_sm_m_axis_1', 'track_sm_m_axis_2',
-           'track_m_p_axis_1', 'track_m_p_axis_2', 'reset_to_default', 'solve_ivp_iterator', 'showcase_results',
-           'pickle_me_this', 'unpickle_me_this']
+           'get_standard_grav_parameter', 'get_hill_radius_relevant_to_body', 'get_hill_radius_array',
+           'get_critical_semi_major_axis', 'get_critical_a_array', 'get_roche_limit', 'get_roche_limit_array',
+           'analytical_lifetime_one_tide', 'get_solar_system_bodies_data', 'get_all_bodies_as_struct', 'CelestialBody',
+           'BodyEnsemble', 'turn_seconds_to_years', 'get_a_derivative_factors_experimental', 'get_a_factors',
+           'get_omega_derivative_factors_experimental', 'get_omega_factors', 'SolveIvpResult',
+           'unpack_solve_ivp_object', 'turn_billion_years_into_seconds', 'bind_system_gravitationally',
+           'state_vector_plot', 'submoon_system_derivative', 'pack_rhs_parameters', 'submoon_system_derivative_packed',
+           'pack_rhs_parameters_ensemble', 'submoon_system_derivative_ensemble', 'update_values', 'track_sm_m_axis_1',
+           'track_sm_m_axis_2', 'track_m_p_axis_1', 'track_m_p_axis_2', 'reset_to_default', 'solve_ivp_iterator',
+           'showcase_results', 'pickle_me_this', 'unpickle_me_this']
 
 
 # noinspection StructuralWrap
@@ -134,7 +157,7 @@ def check_if_direct_orbits(hosting_body: 'CelestialBody', hosted_body: 'Celestia
     """
     if hosted_body.hn == 1:
         raise ValueError('A celestial number of hierarchy 1 (star) cannot be a hosted body.')
-    distance = np.abs(hosted_body.hn - hosting_body.hn)
+    distance = abs(hosted_body.hn - hosting_body.hn)
     if distance != 1:
         raise ValueError(f'The inputted bodies cannot be in direct orbit of each other since their hierarchy numbers'
                          f' are too far apart. Expected difference between hierarchy numbers: 1. Got: {distance}')
@@ -145,46 +168,59 @@ def format_func(value, tick_number):
     return f'{np.round(value, 2)}'
 
 
-def keplers_law_n_from_a(hosting_body: 'CelestialBody', hosted_body: 'CelestialBody') -> float:
+def keplers_law_n_from_a(hosting_body: 'CelestialBody', hosted_body: 'CelestialBody',
+                         check_direct_orbits=True) -> float:
     """
     Gets `hosted_body`'s current semi-major-axis and converts it to the corresponding orbit frequency using Kepler's
     Third Law.
 
-    :parameter hosting_body:    CelestialBody,      The body that is being orbited by `hosted_body`.
-    :parameter hosted_body:     CelestialBody,      The body that orbits `hosting_body`.
+    :parameter hosting_body:            CelestialBody,      The body that is being orbited by `hosted_body`.
+    :parameter hosted_body:             CelestialBody,      The body that orbits `hosting_body`.
+    :parameter check_direct_orbits:     bool,               (Optional) Whether to perform the sanity check specified
+                                                            by the function `check_if_direct_orbits`, see
+                                                            `get_standard_grav_parameter`. Default value: True.
 
     """
-    check_if_direct_orbits(hosting_body, hosted_body)
+    if check_direct_orbits:
+        check_if_direct_orbits(hosting_body, hosted_body)
     mu = get_standard_grav_parameter(hosting_body=hosting_body, hosted_body=hosted_body, check_direct_orbits=False)
-    n = mu ** (1 / 2) * hosted_body.a ** (-3 / 2)
+    a = hosted_body.a
+    n = math.sqrt(mu) / (a * math.sqrt(a))
     return n
 
 
-def keplers_law_n_from_a_simple(a: float, mu: float) -> float:
+def keplers_law_n_from_a_simple(a: Union[float, np.ndarray],
+                                mu: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Same functionality as `keplers_law_n_from_a`, but doesn't fetch the CelestialBody objects since mu needs to be
     provided directly.
+    Both parameters may also be (broadcastable) numpy arrays, in which case an array of orbit frequencies is returned.
 
-    :parameter a:    float,      The semi-major-axis to convert to the corresponding orbit frequency.
-    :parameter mu:   float,      The standard gravitational parameter to use for the conversion.
+    :parameter a:    Union[float, np.ndarray],      The semi-major-axis to convert to the corresponding orbit frequency.
+    :parameter mu:   Union[float, np.ndarray],      The standard gravitational parameter to use for the conversion.
 
     """
-    n = mu ** (1 / 2) * a ** (-3 / 2)
+    n = np.sqrt(mu) * a ** (-1.5)
     return n
 
 
-def keplers_law_a_from_n(hosting_body: 'CelestialBody', hosted_body: 'CelestialBody') -> float:
+def keplers_law_a_from_n(hosting_body: 'CelestialBody', hosted_body: 'CelestialBody',
+                         check_direct_orbits=True) -> float:
     """
     Gets `hosted_body`'s current orbit-frequency and converts it to the corresponding semi-major-axis using Kepler's
     Third Law.
 
-    :parameter hosting_body:    CelestialBody,      The body that is being orbited by `hosted_body`.
-    :parameter hosted_body:     CelestialBody,      The body that orbits `hosting_body`.
+    :parameter hosting_body:            CelestialBody,      The body that is being orbited by `hosted_body`.
+    :parameter hosted_body:             CelestialBody,      The body that orbits `hosting_body`.
+    :parameter check_direct_orbits:     bool,               (Optional) Whether to perform the sanity check specified
+                                                            by the function `check_if_direct_orbits`, see
+                                                            `get_standard_grav_parameter`. Default value: True.
 
     """
-    check_if_direct_orbits(hosting_body, hosted_body)
+    if check_direct_orbits:
+        check_if_direct_orbits(hosting_body, hosted_body)
     mu = get_standard_grav_parameter(hosting_body=hosting_body, hosted_body=hosted_body, check_direct_orbits=False)
-    a = mu ** (1 / 3) * hosted_body.n ** (-2 / 3)
+    a = math.cbrt(mu) * hosted_body.n ** (-2 / 3)
     return a
 
 
@@ -235,10 +271,26 @@ def get_hill_radius_relevant_to_body(hosted_body: 'CelestialBody') -> float:
     j = k.hosting_body
     i = j.hosting_body
 
-    r_h = j.a * (j.mass / (3 * i.mass)) ** (1 / 3)
+    r_h = get_hill_radius_array(a_j=j.a, m_j=j.mass, m_i=i.mass)
     return r_h
 
 
+def get_hill_radius_array(a_j: Union[float, np.ndarray], m_j: Union[float, np.ndarray],
+                          m_i: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Array version of `get_hill_radius_relevant_to_body`, e.g. to get the hill-radii of many system configurations at
+    once. Using the same notation, with `k` orbiting `j` orbiting `i`:
+
+    r_h_k = a_j * (m_j / (3*m_i))**(1/3)
+
+    :parameter a_j:     Union[float, np.ndarray],   The semi-major-axes of the hosting bodies j.
+    :parameter m_j:     Union[float, np.ndarray],   The masses of the hosting bodies j.
+    :parameter m_i:     Union[float, np.ndarray],   The masses of the bodies i that j orbits.
+    :return: r_h:       Union[float, np.ndarray],   The hill-radii.
+    """
+    return a_j * np.cbrt(m_j / (3 * m_i))
+
+
 def get_critical_semi_major_axis(hosted_body: 'CelestialBody') -> float:
     """
     Gets the critical semi-major-axis of `hosted_body` after which it escapes the gravitational influence of its
@@ -256,11 +308,8 @@ def get_critical_semi_major_axis(hosted_body: 'CelestialBody') -> float:
     :param hosted_body: CelestialBody,            The body to find the critical semi-major-axis for.
     :return: a_crit: float,                       The found critical semi-major-axis.
     """
-    if hosted_body.hn == 3:
-        f = 0.4
-    elif hosted_body.hn == 4:
-        f = 0.33
-    else:
+    f = _CRIT_F.get(hosted_body.hn)
+    if f is None:
         raise_warning("WARNING: Can the hill-radius between the planet and star be defined?")
         raise ValueError(f"You can't find the hill radius of the body with hierarchy number {hosted_body.hn},"
                          f" since information about the hosting's body hosting's body needs to be gotten, i.e."
@@ -270,6 +319,26 @@ def get_critical_semi_major_axis(hosted_body: 'CelestialBody') -> float:
     return a_crit
 
 
+def get_critical_a_array(a_j: Union[float, np.ndarray], m_j: Union[float, np.ndarray],
+                         m_i: Union[float, np.ndarray], hn: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Array version of `get_critical_semi_major_axis`. Let `k` be the body of hierarchy number `hn` whose critical
+    semi-major-axis is to be found, orbiting `j` orbiting `i`.
+
+    :parameter a_j:     Union[float, np.ndarray],   The semi-major-axes of the hosting bodies j.
+    :parameter m_j:     Union[float, np.ndarray],   The masses of the hosting bodies j.
+    :parameter m_i:     Union[float, np.ndarray],   The masses of the bodies i that j orbits.
+    :parameter hn:      Union[int, np.ndarray],     The hierarchy numbers of the bodies k. Each has to be 3 or 4.
+    :return: a_crit:    Union[float, np.ndarray],   The critical semi-major-axes.
+    """
+    hn = np.asarray(hn)
+    if not np.all((hn == 3) | (hn == 4)):
+        raise ValueError(f"The critical semi-major-axis is only defined for the hierarchy numbers 3 and 4. Got: "
+                         f"{np.unique(hn)}.")
+    f = np.where(hn == 3, _CRIT_F[3], _CRIT_F[4])
+    return f * get_hill_radius_array(a_j=a_j, m_j=m_j, m_i=m_i)
+
+
 def get_roche_limit(hosted_body: 'CelestialBody') -> float:
     """
     Gets the distance to the primary at which `hosted_body` is disintegrated by tidal forces.
@@ -282,11 +351,27 @@ def get_roche_limit(hosted_body: 'CelestialBody') -> float:
     """
     j = hosted_body
     i = j.hosting_body
-    a_l = j.R * (3 * i.mass / j.mass) ** (1 / 3)
+    a_l = get_roche_limit_array(R_j=j.R, m_i=i.mass, m_j=j.mass)
     return a_l
 
 
-def analytical_lifetime_one_tide(a_0: float, a_c: float, hosted_body: 'CelestialBody') -> float:
+def get_roche_limit_array(R_j: Union[float, np.ndarray], m_i: Union[float, np.ndarray],
+                          m_j: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Array version of `get_roche_limit`. Let j be the hosted bodies and i their hosting bodies. Then
+
+    a_l = R_j * (3*m_i / m_j )**(1/3)
+
+    :parameter R_j:     Union[float, np.ndarray],   The mean radii of the hosted bodies j.
+    :parameter m_i:     Union[float, np.ndarray],   The masses of the hosting bodies i.
+    :parameter m_j:     Union[float, np.ndarray],   The masses of the hosted bodies j.
+    :return: a_l:       Union[float, np.ndarray],   The roche limits.
+    """
+    return R_j * np.cbrt(3 * m_i / m_j)
+
+
+def analytical_lifetime_one_tide(a_0: Union[float, np.ndarray], a_c: Union[float, np.ndarray],
+                                 hosted_body: 'CelestialBody') -> Union[float, np.ndarray]:
     """
     Calculates the time it takes for the semi-major-axis to reach `a_i` ,starting from `a_0` using the inputted set of
     parameters describing the system. This represents the analytical formula for the lifetime T in a one-tide-system,
@@ -296,24 +381,77 @@ def analytical_lifetime_one_tide(a_0: float, a_c: float, hosted_body: 'Celestial
 
     T = 2/13 * a_0^(13/2) * ( 1-(a_i/a_0) ^ (13/2) ) * ( 3k_{2i} / Q_i * R_i^5 * m_j * (G/m_i)^(1/2) )^(-1)
 
-    :parameter a_0:         float,              The initial semi-major-axis of the satellite j.
-    :parameter a_c:         float,              The semi-major-axis value of j to evolve to.
-    :parameter hosted_body: CelestialBody,      The satellite j to evolve.
-    :return: T:             float,              The analytically calculated time it took for the evolution.
-    """
-    j = hosted_body
-    i = j.hosting_body
-    left_hand_side = 2 / 13 * a_c ** (13 / 2) * (1 - (a_0 / a_c) ** (13 / 2))
-    right_hand_side = 3 * i.k / i.Q * (G / i.mass) ** (1 / 2) * i.R ** 5 * j.mass
-    T = left_hand_side / right_hand_side
+    The right-hand side only depends on the bodies and is cached on the satellite, see `CelestialBody.tidal_rhs`.
+    `a_0` and `a_c` may also be (broadcastable) numpy arrays, e.g. to sweep over many initial values at once.
+
+    :parameter a_0:         Union[float, np.ndarray],   The initial semi-major-axis of the satellite j.
+    :parameter a_c:         Union[float, np.ndarray],   The semi-major-axis value of j to evolve to.
+    :parameter hosted_body: CelestialBody,              The satellite j to evolve.
+    :return: T:             Union[float, np.ndarray],   The analytically calculated time it took for the evolution.
+    """
+    # x^(13/2) = x^6 * sqrt(x), which avoids the generic (log + exp) power function
+    a_c2 = a_c * a_c
+    a_c6 = a_c2 * a_c2 * a_c2
+    ratio = a_0 / a_c
+    ratio2 = ratio * ratio
+    ratio6 = ratio2 * ratio2 * ratio2
+    left_hand_side = 2 / 13 * a_c6 * np.sqrt(a_c) * (1 - ratio6 * np.sqrt(ratio))
+    T = left_hand_side / hosted_body.tidal_rhs
     return T
 
 
-def dont():
+# The columns of the `constants/*_solar_system.txt` files, each mapped to (the column name without its unit,
+# the shorthand). Both are accepted values of the parameter `physical_property` of `get_solar_system_bodies_data`,
+# and the shorthands also name the whole-row values of `get_solar_system_bodies_data` and the fields of
+# `get_all_bodies_as_struct`.
+_COLUMN_ALIASES = {
+    'Mass-(kg)': ('Mass', 'm'),
+    'Semi-major-axis-(m)': ('Semi-major-axis', 'a'),
+    'Diameter-(m)': ('Diameter', 'd'),
+    'Orbital-Period-(days)': ('Orbital-Period', 'T_orbit_days'),
+    'Orbital-eccentricity': ('Orbital-eccentricity', 'e'),
+    'Density-(kg/m^3)': ('Density', 'rho'),
+    'Rotation-Period-(hours)': ('Rotation-Period', 'T_rotation_hours'),
+    '2nd-Tidal-Love-Number-(Estimate)': ('2nd-Tidal-Love-Number', 'k'),
+    'Quality-factor-(Estimate)': ('Quality-factor', 'Q'),
+}
+
+
+def _aliases(column_name: str) -> tuple:
+    # All names under which the column `column_name` can be queried, including its full name
+    return (column_name,) + _COLUMN_ALIASES[column_name]
+
+
+def _shorthand(column_name: str) -> str:
+    # The shorthand of the column `column_name`, e.g. 'm' for 'Mass-(kg)'
+    return _COLUMN_ALIASES[column_name][1]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_bodies(file_to_read: str) -> pd.DataFrame:
     """
-    Do nothing function.
+    Reads and caches the contents of one of the `constants/*_solar_system.txt` files, indexed by the body's name, such
+    that repeated calls of `get_solar_system_bodies_data` (e.g. inside parameter sweeps) don't re-parse the file.
+    The returned data frame is shared between calls and must not be modified.
+    All physical properties are parsed as floats. Missing values, marked as '-' inside the files, become NaN.
+
+    :param file_to_read: str,       The file to read from, for example 'planets_solar_system.txt'.
+    :return: pd.DataFrame,          The file's table with the column 'Body' as index.
     """
-    pass
+    return pd.read_csv(file_to_read, dtype={column: float for column in _COLUMN_ALIASES}, na_values='-',
+                       skipinitialspace=True).set_index('Body')
+
+
+@functools.lru_cache(maxsize=8)
+def _column_index(file_to_read: str) -> dict:
+    """
+    Maps every accepted name of a physical property (see `_COLUMN_ALIASES`) to the full column name inside
+    `file_to_read`. Cached like `_load_bodies`.
+
+    :param file_to_read: str,       The file to read from, for example 'planets_solar_system.txt'.
+    :return: dict,                  The mapping from alias to full column name.
+    """
+    return {short: full for full in _load_bodies(file_to_read).columns for short in _aliases(full)}
 
 
 def get_solar_system_bodies_data(file_to_read: str, name_of_celestial_body: str = '', physical_property: str = '',
@@ -339,66 +477,78 @@ def get_solar_system_bodies_data(file_to_read: str, name_of_celestial_body: str
     If `planet_name` and `physical_property` is provided, a float will be returned that represent the queried
     physical property.
 
+    Values that are missing inside the file (marked as '-') are returned as NaN.
+
     :param file_to_read: str,                  The file to read from, for example 'planets_solar_system.txt'.
     :param name_of_celestial_body: str,        One of: Mercury, Venus, Earth, Mars, Jupiter, Saturn, Uranus or Neptune.
     :param physical_property: str,  One of: Mass, Semi-major-axis, Diameter, Orbital-Period, Orbital-eccentricity,
-                                            Density, Rotation-Period, 2nd-Tidal-Love-Number, Quality-factor.
+                                            Density, Rotation-Period, 2nd-Tidal-Love-Number, Quality-factor, their
+                                            full column names (e.g. 'Mass-(kg)') or the shorthands listed above.
     :param print_return: bool,      Print what is returned.
     """
-    df = pd.read_csv(file_to_read)
+    df = _load_bodies(file_to_read)
     whole_row_mode = (name_of_celestial_body != '' and physical_property == '')
     specific_value_mode = (name_of_celestial_body != '' and physical_property != '')
 
-    def turn_to_float_if_possible(x):
-        if isinstance(x, Union[float, int, np.int64]):
-            return x
-        elif isinstance(x, str):
-            represents_digit = x.replace(".", "", 1).isdigit()
-            if represents_digit:
-                return float(x)
-            else:
-                return x
-        else:
-            raise_warning("Unexpected situation arisen inside function `get_solar_system_bodies_data`.")
-
     if whole_row_mode:
-        row = df[df['Body'] == name_of_celestial_body]
-        row_nice_representation = row.iloc[0]
+        row_nice_representation = df.loc[name_of_celestial_body]
 
-        columns = row_nice_representation.index.values  # Array
-        # prints: ['Body' 'Mass-(kg)' 'Semi-major-axis-(m)' 'Diameter-(m)' 'Orbital-Period-(days)'
-        # 'Orbital-eccentricity' 'Density-(kg/m^3)' 'Rotation-Period-(hours)' '2nd-Tidal-Love-Number-(Estimate)'
-        # 'Quality-factor-(Estimate)'] => Now we hardcode shorthands.
-        columns_shorthand = ['name', 'm', 'a', 'd', 'T_orbit_days', 'e', 'rho', 'T_rotation_hours', 'k', 'Q']
-        values = [turn_to_float_if_possible(x) for x in row_nice_representation.values]  # Array
+        # The 'Body' column is the index, all other columns are named by their shorthands, see `_COLUMN_ALIASES`.
+        columns_shorthand = ['name'] + [_shorthand(column) for column in df.columns]
+        values = [name_of_celestial_body] + row_nice_representation.tolist()  # Already floats, see `_load_bodies`
 
         # Create canonical python dict and then instantiate custom class in which dict values can be accessed via dot
         # notation (I prefer it that way)
         normal_dict = dict(zip(columns_shorthand, values))
         special_dict = SpecialDict(normal_dict)
 
-        print(row_nice_representation) if print_return else dont()
+        if print_return:
+            print(row_nice_representation)
         return special_dict
 
     elif specific_value_mode:
-        row = df[df['Body'] == name_of_celestial_body]
-        row_nice_representation = row.iloc[0]
-        all_column_names = df.columns.tolist()
-        user_short_hand = physical_property
-        selected_index = 0
-        for index, column_name in enumerate(all_column_names):
-            if user_short_hand in column_name:
-                selected_index = index
-                break
-        res = turn_to_float_if_possible(row_nice_representation[all_column_names[selected_index]])
-        print(res) if print_return else dont()
+        row_nice_representation = df.loc[name_of_celestial_body]
+        column_index = _column_index(file_to_read)
+        if physical_property not in column_index:
+            raise ValueError(f"Unknown physical property '{physical_property}'. Expected one of: "
+                             f"{list(column_index.keys())}.")
+        res = row_nice_representation[column_index[physical_property]]
+        if print_return:
+            print(res)
         return res
     else:
         print(df)
 
 
+def get_all_bodies_as_struct(file_to_read: str) -> np.ndarray:
+    """
+    Returns all bodies of `file_to_read` as one numpy structured array, e.g. for building ensembles of bodies. The
+    fields are named like the shorthands of `get_solar_system_bodies_data`:
+
+    ['name', 'm', 'a', 'd', 'T_orbit_days', 'e', 'rho', 'T_rotation_hours', 'k', 'Q'].
+
+    planets = get_all_bodies_as_struct('constants/planets_solar_system.txt')
+    masses = planets['m']
+
+    :param file_to_read: str,       The file to read from, for example 'planets_solar_system.txt'.
+    :return: np.ndarray,            The structured array with one element per body. Missing values are NaN.
+    """
+    df = _load_bodies(file_to_read)
+    shorthands = [_shorthand(column) for column in df.columns]
+    struct = np.empty(len(df), dtype=[('name', f'U{df.index.str.len().max()}')] + [(sh, float) for sh in shorthands])
+    struct['name'] = df.index.to_numpy()
+    for column, shorthand in zip(df.columns, shorthands):
+        struct[shorthand] = df[column].to_numpy()
+    return struct
+
+
 class CelestialBody:
 
+    # Fixed set of attributes: faster attribute access inside the integration and less memory per body. Attributes
+    # like `a0` and `omega0` can still be attached by hand, see `bind_system_gravitationally`.
+    __slots__ = ('a0', 'omega0', 'mass', 'rho', '_R', '_R5', '_I', 'omega', 'k', 'Q', 'descriptive_index', 'name',
+                 'hn', 'oscillation_counter', '_tidal_rhs', 'hosting_body', 'a', '_mu', '_sqrt_mu')
+
     def __init__(self, mass: float, density: float, semi_major_axis: Union[float, None], spin_frequency: float,
                  love_number: float, quality_factor: float, descriptive_index: str, name: str, hierarchy_number: int,
                  hosting_body: Union['CelestialBody', None]):
@@ -450,6 +600,7 @@ class CelestialBody:
                                         specified by `self.hosting_body`.
         R:                              Assuming a spherical volume, calculates the mean radius based on mass and density.
         I:                              Assuming I = 2/5 M R^2, calculates the inertial moment.
+        tidal_rhs:                      The right-hand side of the analytical one-tide lifetime formula.
 
         """
 
@@ -457,6 +608,10 @@ class CelestialBody:
         self.omega0 = None  # Can be updated dynamically when setting up the solve_ivp.
         self.mass = mass
         self.rho = density
+        # Mass and density never change during an integration, so radius and inertial moment are calculated only once.
+        self._R = math.cbrt(3 * mass / density / (4 * math.pi))
+        self._R5 = self._R ** 5
+        self._I = 2 / 5 * mass * self._R ** 2
         self.omega = spin_frequency
         self.k = love_number
         self.Q = quality_factor
@@ -465,11 +620,14 @@ class CelestialBody:
         self.hn = hierarchy_number
         self.oscillation_counter = 0  # How many times the signum function flipped the sign the semi-major-axis
         # or spin frequency derivative
+        self._tidal_rhs = None  # Calculated lazily, see `self.tidal_rhs`
 
         if hierarchy_number == 1:
             # Star has no hosting body.
             self.hosting_body = None
             self.a = None
+            self._mu = None
+            self._sqrt_mu = None
         else:
             self.a = semi_major_axis
             try:
@@ -478,12 +636,20 @@ class CelestialBody:
             except ValueError as err:
                 raise ValueError(f"The hosting body's hierarchy number does not match with the hierarchy number of "
                                  f" the instantiated celestial body '{self.name}': Error message: ", err)
+            # Neither `self.mass` nor the hosting body's mass change during an integration.
+            self._mu = get_standard_grav_parameter(hosting_body=hosting_body, hosted_body=self,
+                                                   check_direct_orbits=False)
+            self._sqrt_mu = math.sqrt(self._mu)
 
     def __str__(self):
         head_line = f"\nCelestialBody `{self.name}` \n"
         seperator = "---------------"
         properties = "\n"
-        for name, val in self.__dict__.items():
+        for name in self.__slots__:
+            if name.startswith('_'):
+                # internal caches, not part of the body's description
+                continue
+            val = getattr(self, name)
             if name == 'hosting_body' and val is not None:
                 # to not print all of this again for the hosting body
                 properties += f"hosting_body: CelestialBody `{val.name}`\n"
@@ -517,11 +683,17 @@ class CelestialBody:
         semi-major-axis `a`. For this, the body that hosts `self` is needed.
         Since the `@property` decorator is used, this can be accessed like an attribute, `self.n`
 
+        Unlike the `keplers_law_*` helpers, this does not call `check_if_direct_orbits`, since the relationship between
+        `self` and its hosting body was already validated during initialization.
+
         :return orbit_frequency:    float,              The calculated orbit frequency.
 
         """
-        n = keplers_law_n_from_a(hosting_body=self.hosting_body, hosted_body=self)
-        return n
+        if self._sqrt_mu is None:
+            # A star has no hosting body. Raise the same error as the `keplers_law_*` helpers would.
+            check_if_direct_orbits(hosting_body=self.hosting_body, hosted_body=self)
+        a = self.a
+        return self._sqrt_mu / (a * math.sqrt(a))
 
     @property
     def mu(self) -> float:
@@ -531,10 +703,11 @@ class CelestialBody:
         No need to check whether hosting and hosted bodies are really in direct orbits of each other since this
         was already checked in the initialization.
         Since the `@property` decorator is used, this can be accessed like an attribute, `self.mu`
+        The value is calculated once during initialization.
 
         :return: mu:            float,              The calculated mu value.
         """
-        return get_standard_grav_parameter(hosting_body=self.hosting_body, hosted_body=self, check_direct_orbits=False)
+        return self._mu
 
     @property
     def R(self) -> float:
@@ -542,11 +715,11 @@ class CelestialBody:
         Gets the mean circular radius of `self` based on its mass.
         mass = rho * V  => V = mass / rho
         r =  ( 3*V / (4*np.pi) ) **(1/3) = ( 3 * mass / rho / (4*np.pi) ) **(1/3)
+        The value is calculated once during initialization.
 
         :return: r:            float,              The calculated mean radius value.
         """
-        r = (3 * self.mass / self.rho / (4 * np.pi)) ** (1 / 3)
-        return r
+        return self._R
 
     @property
     def I(self) -> float:
@@ -554,11 +727,28 @@ class CelestialBody:
         Gets the inertial moment based on the assumption of a rotation sphere of radius R with mass M:
 
         I = 2/5 M R^2
+        The value is calculated once during initialization.
         ToDo: Introduce alpha parameter to increase accuracy
         :return: float,     The calculated inertial moment
         """
-        I = 2 / 5 * self.mass * self.R ** 2
-        return I
+        return self._I
+
+    @property
+    def tidal_rhs(self) -> float:
+        """
+        Gets the right-hand side of the analytical one-tide lifetime formula, see `analytical_lifetime_one_tide`.
+        Let j be `self` and i its hosting body. Then
+
+        3 k_i / Q_i * (G/m_i)^(1/2) * R_i^5 * m_j.
+
+        This does not depend on the semi-major-axis and is therefore calculated only on first access.
+
+        :return: float,     The calculated right-hand side.
+        """
+        if self._tidal_rhs is None:
+            i = self.hosting_body
+            self._tidal_rhs = 3 * i.k / i.Q * math.sqrt(G / i.mass) * i._R5 * self.mass
+        return self._tidal_rhs
 
     def get_current_roche_limit(self) -> float:
         # Distance to its hosting body, at which `self` is disintegrated
@@ -571,49 +761,174 @@ class CelestialBody:
         return crit_sm_axis
 
 
-def turn_seconds_to_years(seconds: float, keyword: str = "Vanilla") -> float:
+class BodyEnsemble:
+
+    def __init__(self, mass: np.ndarray, rho: np.ndarray, k: np.ndarray, Q: np.ndarray, hn: np.ndarray,
+                 hosting_idx: np.ndarray, a: np.ndarray):
+        """
+        Structure-of-arrays counterpart of `CelestialBody`: Each attribute is a numpy array of length N, whose n-th
+        element belongs to the n-th body of the ensemble. This allows to calculate a physical quantity for all bodies
+        (e.g. of many planetary systems inside a parameter sweep) with one numpy operation, instead of one python call
+        per `CelestialBody`.
+
+        Usually constructed via `BodyEnsemble.from_celestial_bodies(list_of_bodies)`.
+
+        Attributes:
+        ----------------
+
+        :parameter mass:            np.ndarray,     The bodies' masses.
+        :parameter rho:             np.ndarray,     The bodies' mean densities.
+        :parameter k:               np.ndarray,     The bodies' second tidal love numbers.
+        :parameter Q:               np.ndarray,     The bodies' quality factors.
+        :parameter hn:              np.ndarray,     The bodies' hierarchy numbers.
+        :parameter hosting_idx:     np.ndarray,     The index (inside the ensemble) of each body's hosting body. -1 for
+                                                    bodies without hosting body (stars).
+        :parameter a:               np.ndarray,     The bodies' semi-major-axes. NaN for stars.
+
+        Derived attributes, calculated once during initialization:
+
+        R5:                         The mean radii to the fifth power, see `CelestialBody.R`.
+        I:                          The inertial moments, see `CelestialBody.I`.
+        mu:                         The standard gravitational parameters between each body and its hosting body. NaN
+                                    for stars.
+
+        """
+        self.mass = np.asarray(mass, dtype=float)
+        self.rho = np.asarray(rho, dtype=float)
+        self.k = np.asarray(k, dtype=float)
+        self.Q = np.asarray(Q, dtype=float)
+        self.hn = np.asarray(hn, dtype=int)
+        self.hosting_idx = np.asarray(hosting_idx, dtype=int)
+        self.a = np.asarray(a, dtype=float)
+
+        R = np.cbrt(3 * self.mass / self.rho / (4 * np.pi))  # See `CelestialBody.R`
+        R2 = R * R
+        self.R5 = R2 * R2 * R
+        self.I = 2 / 5 * self.mass * R2  # See `CelestialBody.I`
+        has_host = self.hosting_idx >= 0
+        self.mu = np.where(has_host, G * (self.mass + self.mass[self.hosting_idx]), np.nan)
+
+    def __len__(self):
+        return len(self.mass)
+
+    @classmethod
+    def from_celestial_bodies(cls, list_of_bodies: List['CelestialBody']) -> 'BodyEnsemble':
+        """
+        Packs a list of `CelestialBody` instances into a `BodyEnsemble`. The list may contain the bodies of several
+        planetary systems, but every hosting body has to be part of the list as well.
+
+        :param list_of_bodies: List['CelestialBody'],      The bodies to pack. Their order is kept.
+        :return: BodyEnsemble,                              The packed ensemble.
+        """
+        index_of = {id(body): index for index, body in enumerate(list_of_bodies)}
+        hosting_idx = []
+        for body in list_of_bodies:
+            if body.hosting_body is None:
+                hosting_idx.append(-1)
+            elif id(body.hosting_body) in index_of:
+                hosting_idx.append(index_of[id(body.hosting_body)])
+            else:
+                raise ValueError(f"The hosting body `{body.hosting_body.name}` of `{body.name}` is not part of the "
+                                 f"inputted list of bodies.")
+
+        return cls(mass=[body.mass for body in list_of_bodies],
+                   rho=[body.rho for body in list_of_bodies],
+                   k=[body.k for body in list_of_bodies],
+                   Q=[body.Q for body in list_of_bodies],
+                   hn=[body.hn for body in list_of_bodies],
+                   hosting_idx=hosting_idx,
+                   a=[np.nan if body.a is None else body.a for body in list_of_bodies])
+
+    def n(self, indices: Union[int, np.ndarray, slice] = slice(None)) -> Union[float, np.ndarray]:
+        """
+        Uses Kepler's Third Law to get the current orbit frequencies of the bodies at `indices`, see `CelestialBody.n`.
+
+        :param indices: Union[int, np.ndarray, slice],     (Optional) The bodies to get the orbit frequencies for.
+                                                            Default: All bodies.
+        :return: Union[float, np.ndarray],                  The calculated orbit frequencies.
+        """
+        return keplers_law_n_from_a_simple(self.a[indices], self.mu[indices])
+
+
+def turn_seconds_to_years(seconds: Union[float, np.ndarray], keyword: str = "Vanilla") -> Union[float, np.ndarray]:
     """
     Converts seconds into years ("Vanilla"), millions ("Millions") or billions ("Billions") of years.
-    :param seconds: float,  The seconds to convert.
-    :param keyword: str,    Either "Vanilla", "Millions" or "Billions".
-    :return: float, the converted time. Result is rounded to two decimal places.
-    """
-    conversion_factor = 3600 * 24 * 365
-    seconds_in_years = seconds / conversion_factor
-    if keyword == "Vanilla":
-        return np.round(seconds_in_years, 2)
-    elif keyword == "Millions":
-        return np.round(seconds_in_years / 10 ** 6, 2)
-    elif keyword == "Billions":
-        return np.round(seconds_in_years / 10 ** 9, 2)
-    else:
+    :param seconds: Union[float, np.ndarray],  The seconds to convert.
+    :param keyword: str,                       Either "Vanilla", "Millions" or "Billions".
+    :return: Union[float, np.ndarray], the converted time. Result is rounded to two decimal places.
+    """
+    conversion_factor = _SEC_PER_UNIT.get(keyword)
+    if conversion_factor is None:
         raise_warning("Something unexpected occured inside function `turn_seconds_to_years`.")
+        return None
+    if isinstance(seconds, np.ndarray):
+        return np.round(seconds / conversion_factor, 2)
+    return round(seconds / conversion_factor, 2)
 
 
-def get_a_derivative_factors_experimental(hosted_body: 'CelestialBody') -> float:
+def _a_factor_kernel(iR5: float, sqrt_jmu: float, ik: float, iQ: float, imass: float, jmass: float) -> float:
     """
+    The arithmetic of `get_a_derivative_factors_experimental`, operating on floats (or arrays, for a `BodyEnsemble`)
+    only. Not compiled with numba: for a single expression the dispatch overhead outweighs the gain. The factors
+    are instead pre-packed once per integration, see `pack_rhs_parameters`.
 
-    :parameter hosted_body:             CelestialBody,      The satellite.
+    :parameter iR5:         float,      The hosting body's radius to the fifth power.
+    :parameter sqrt_jmu:    float,      The square root of the standard gravitational parameter between both bodies.
+    :parameter ik:          float,      The hosting body's second tidal love number.
+    :parameter iQ:          float,      The hosting body's quality factor.
+    :parameter imass:       float,      The hosting body's mass.
+    :parameter jmass:       float,      The satellite's mass.
     :return: float, the calculated multiplicative factor for the sm-axis derivative.
     """
+    return 3 * iR5 * sqrt_jmu * ik * jmass / (iQ * imass)
+
+
+def get_a_derivative_factors_experimental(hosted_body: Union['CelestialBody', 'BodyEnsemble'],
+                                          indices: Union[int, np.ndarray, slice, None] = None
+                                          ) -> Union[float, np.ndarray]:
+    """
+
+    :parameter hosted_body:             Union[CelestialBody, BodyEnsemble],     The satellite, or an ensemble of
+                                                                                bodies.
+    :parameter indices:                 Union[int, np.ndarray, slice, None],    (Optional) Only used if `hosted_body`
+                                                                                is a `BodyEnsemble`: The satellites
+                                                                                inside the ensemble to calculate the
+                                                                                factors for. Default: All satellites.
+    :return: Union[float, np.ndarray], the calculated multiplicative factor(s) for the sm-axis derivative.
+    """
+    if isinstance(hosted_body, BodyEnsemble):
+        ens = hosted_body
+        j = np.arange(len(ens))[ens.hosting_idx >= 0] if indices is None else indices
+        i = ens.hosting_idx[j]
+        return _a_factor_kernel(ens.R5[i], np.sqrt(ens.mu[j]), ens.k[i], ens.Q[i], ens.mass[i], ens.mass[j])
+
     j = hosted_body
     i = j.hosting_body
-    res = 3 * i.R ** 5 * j.mu ** (1 / 2) * i.k * j.mass / (i.Q * i.mass)
-    return res
+    return _a_factor_kernel(i._R5, j._sqrt_mu, i.k, i.Q, i.mass, j.mass)
 
 
-def get_omega_derivative_factors_experimental(body: 'CelestialBody') -> float:
+def get_omega_derivative_factors_experimental(body: Union['CelestialBody', 'BodyEnsemble'],
+                                              indices: Union[int, np.ndarray, slice, None] = None
+                                              ) -> Union[float, np.ndarray]:
     """
     Represents the common, multiplicative factors of the omega dot equations, see
 
     https://github.com/iason-saganas/stability-of-submoons
 
     for the equations
-    :param body:        The body that indexes the quantities to catch in an omega dot equation. See again the equations.
-    :return:    float, the calculated multiplicative factors
+    :param body:        The body that indexes the quantities to catch in an omega dot equation, or an ensemble of
+                        bodies. See again the equations.
+    :param indices:     (Optional) Only used if `body` is a `BodyEnsemble`: The bodies inside the ensemble to calculate
+                        the factors for. Default: All bodies.
+    :return:    Union[float, np.ndarray], the calculated multiplicative factor(s)
     """
+    if isinstance(body, BodyEnsemble):
+        i = slice(None) if indices is None else indices
+        ens = body
+        return 3 * G * ens.R5[i] * ens.k[i] / (2 * ens.Q[i] * ens.I[i])
+
     i = body
-    res = 3 * G * i.R ** 5 * i.k / (2 * i.Q * i.I)
+    res = 3 * G * i._R5 * i.k / (2 * i.Q * i.I)
     return res
 
 
@@ -622,22 +937,32 @@ get_a_factors = get_a_derivative_factors_experimental
 get_omega_factors = get_omega_derivative_factors_experimental
 
 
-def unpack_solve_ivp_object(solve_ivp_sol_object):
+class SolveIvpResult(NamedTuple):
     """
-    Unpacks some variables deemed to be relevant from the returned object by the function `solve_ivp`
+    The variables deemed to be relevant from the object returned by `solve_ivp`, see `unpack_solve_ivp_object`.
+    Can be tuple-unpacked in the order given below or accessed via dot notation, e.g. `result.time_points`.
     """
-    time_points = np.array(solve_ivp_sol_object.t)
-    solution = np.array(solve_ivp_sol_object.y)
-    t_events = solve_ivp_sol_object.t_events
-    y_events = solve_ivp_sol_object.y_events
-    num_of_eval = np.array(solve_ivp_sol_object.nfev)
-    num_of_eval_jac = np.array(solve_ivp_sol_object.njev)
-    num_of_lu_decompositions = np.array(solve_ivp_sol_object.nlu)
-    status = np.array(solve_ivp_sol_object.status)
-    message = np.array(solve_ivp_sol_object.message)
-    success = np.array(solve_ivp_sol_object.success)
-    return (time_points, solution, t_events, y_events, num_of_eval, num_of_eval_jac,
-            num_of_lu_decompositions, status, message, success)
+    time_points: np.ndarray
+    solution: np.ndarray
+    t_events: Union[List[np.ndarray], None]
+    y_events: Union[List[np.ndarray], None]
+    num_of_eval: int
+    num_of_eval_jac: int
+    num_of_lu_decompositions: int
+    status: int
+    message: str
+    success: bool
+
+
+def unpack_solve_ivp_object(solve_ivp_sol_object) -> SolveIvpResult:
+    """
+    Unpacks some variables deemed to be relevant from the returned object by the function `solve_ivp`.
+    No copies are made: `t` and `y` already are numpy arrays and the remaining attributes are returned as they are.
+    `t_events` and `y_events` stay lists, since the arrays they contain generally differ in length.
+    """
+    sol = solve_ivp_sol_object
+    return SolveIvpResult(sol.t, sol.y, sol.t_events, sol.y_events, sol.nfev, sol.njev, sol.nlu, sol.status,
+                          sol.message, sol.success)
 
 
 def turn_billion_years_into_seconds(num: float) -> float:
@@ -902,6 +1227,140 @@ def submoon_system_derivative(t, y, planetary_system: List['CelestialBody'], mu_
     return dy_dt
 
 
+def pack_rhs_parameters(planetary_system: List['CelestialBody'], mu_m_sm, mu_p_m, mu_s_p) -> np.ndarray:
+    """
+    Packs everything `submoon_system_derivative` needs from the `CelestialBody` instances into one flat array, such
+    that the derivative can be calculated by `submoon_system_derivative_packed` without any attribute lookups.
+    None of the packed quantities change during an integration, so this only needs to be called once per
+    `solve_ivp` call.
+
+    Order of the returned parameters:
+    [sqrt(mu_m_sm), sqrt(mu_p_m), sqrt(mu_s_p),
+     a-factor submoon, a-factor moon, a-factor planet,
+     omega-factor moon, omega-factor planet, omega-factor star,
+     m_s^2, m_p^2, m_m^2, m_sm^2]
+
+    :param planetary_system: List['CelestialBody'],    The system, ordered as star, planet, moon, submoon.
+    :return: params: np.ndarray,                        The packed parameters.
+    """
+    star, planet, moon, submoon = planetary_system
+    return np.array([np.sqrt(mu_m_sm), np.sqrt(mu_p_m), np.sqrt(mu_s_p),
+                     get_a_factors(submoon), get_a_factors(moon), get_a_factors(planet),
+                     get_omega_factors(moon), get_omega_factors(planet), get_omega_factors(star),
+                     star.mass ** 2, planet.mass ** 2, moon.mass ** 2, submoon.mass ** 2], dtype=float)
+
+
+@njit(cache=True)
+def _submoon_system_rhs_kernel(y: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    The arithmetic of `submoon_system_derivative` for N independent systems, operating on arrays only such that it
+    can be compiled by numba. This is the only copy of the equations used by `submoon_system_derivative_packed` and
+    `submoon_system_derivative_ensemble`, see `consistency_check_derivatives`.
+
+    :param y:       np.ndarray,     The state vectors of shape (6, N), one column per system.
+    :param params:  np.ndarray,     The parameters of shape (13, N), see `pack_rhs_parameters` for the row layout.
+    :return: dy_dt: np.ndarray,     The derivatives of shape (6, N).
+
+    Compiled without `fastmath` and with float exponents only, such that degenerate states (zero, negative or NaN
+    semi-major-axes, e.g. trial states of the Radau Newton iteration) give inf or NaN like numpy instead of raising
+    or being silently turned into finite values.
+    """
+    a_m_sm, a_p_m, a_s_p, omega_m, omega_p, omega_s = y[0], y[1], y[2], y[3], y[4], y[5]
+
+    n_m_sm = params[0] * a_m_sm ** (-1.5)
+    n_p_m = params[1] * a_p_m ** (-1.5)
+    n_s_p = params[2] * a_s_p ** (-1.5)
+
+    sign_m_sm = np.sign(omega_m - n_m_sm)
+    sign_m_p_m = np.sign(omega_m - n_p_m)
+    sign_p_p_m = np.sign(omega_p - n_p_m)
+    sign_p_s_p = np.sign(omega_p - n_s_p)
+    sign_s_s_p = np.sign(omega_s - n_s_p)
+
+    dy_dt = np.empty((6, y.shape[1]))
+    dy_dt[0] = params[3] * sign_m_sm * a_m_sm ** (-5.5)
+    dy_dt[1] = params[4] * sign_p_p_m * a_p_m ** (-5.5)
+    dy_dt[2] = params[5] * sign_s_s_p * a_s_p ** (-5.5)
+    dy_dt[3] = -params[6] * (sign_m_p_m * params[10] * a_p_m ** (-6.0) + sign_m_sm * params[12] * a_m_sm ** (-6.0))
+    dy_dt[4] = -params[7] * (sign_p_s_p * params[9] * a_s_p ** (-6.0) + sign_p_p_m * params[11] * a_p_m ** (-6.0))
+    dy_dt[5] = -params[8] * sign_s_s_p * params[10] * a_s_p ** (-6.0)
+    return dy_dt
+
+
+def submoon_system_derivative_packed(t, y, params: np.ndarray) -> np.ndarray:
+    """
+    Same as `submoon_system_derivative`, but with the bodies' properties pre-packed by `pack_rhs_parameters`. The
+    integrator then only passes numpy arrays to the (numba-compiled, if available) kernel.
+    This is `submoon_system_derivative_ensemble` for a single system.
+
+    :param t:       float,          The current time. Unused, but required by `solve_ivp`.
+    :param y:       np.ndarray,     The current state vector [a_m_sm, a_p_m, a_s_p, omega_m, omega_p, omega_s].
+    :param params:  np.ndarray,     The parameters returned by `pack_rhs_parameters`.
+    :return: dy_dt: np.ndarray,     The derivative of the state vector.
+    """
+    return submoon_system_derivative_ensemble(t, y, params[:, None])
+
+
+def pack_rhs_parameters_ensemble(ensemble: 'BodyEnsemble') -> np.ndarray:
+    """
+    Packs the parameters of N independent planetary systems, see `pack_rhs_parameters`, as the columns of one array.
+    Every submoon (hierarchy number 4) inside `ensemble` defines one system, together with its moon, planet and star,
+    found via `hosting_idx`. The systems are ordered like their submoons inside the ensemble.
+
+    :param ensemble: BodyEnsemble,      The bodies of the N systems, e.g. from `BodyEnsemble.from_celestial_bodies`.
+    :return: params: np.ndarray,        The packed parameters, of shape (13, N).
+    """
+    submoon = np.flatnonzero(ensemble.hn == 4)
+    moon = ensemble.hosting_idx[submoon]
+    planet = ensemble.hosting_idx[moon]
+    star = ensemble.hosting_idx[planet]
+    mass = ensemble.mass
+    return np.stack([np.sqrt(ensemble.mu[submoon]), np.sqrt(ensemble.mu[moon]), np.sqrt(ensemble.mu[planet]),
+                     get_a_factors(ensemble, submoon), get_a_factors(ensemble, moon), get_a_factors(ensemble, planet),
+                     get_omega_factors(ensemble, moon), get_omega_factors(ensemble, planet),
+                     get_omega_factors(ensemble, star),
+                     mass[star] ** 2, mass[planet] ** 2, mass[moon] ** 2, mass[submoon] ** 2])
+
+
+def submoon_system_derivative_ensemble(t, y, params: np.ndarray) -> np.ndarray:
+    """
+    Calculates the derivatives of N independent planetary systems at once. Every quantity is one array operation over
+    all N systems, instead of N calls of `submoon_system_derivative_packed`. Useful for parameter sweeps over e.g.
+    initial semi-major-axes, quality factors or love numbers, where the same equations are solved for many systems.
+
+    Since `solve_ivp` only handles flat state vectors, `y` holds the six state vector components of all systems
+    one after another: [a_m_sm (N values), a_p_m (N values), ..., omega_s (N values)].
+
+    :param t:       float,          The current time. Unused, but required by `solve_ivp`.
+    :param y:       np.ndarray,     The flattened state vectors of shape (6*N,).
+    :param params:  np.ndarray,     The parameters returned by `pack_rhs_parameters_ensemble`, of shape (13, N).
+    :return: dy_dt: np.ndarray,     The flattened derivatives of shape (6*N,), ordered like `y`.
+    """
+    return _submoon_system_rhs_kernel(np.reshape(np.asarray(y, dtype=float), (6, -1)), params).ravel()
+
+
+def consistency_check_derivatives(planetary_system: List['CelestialBody'], mu_m_sm, mu_p_m, mu_s_p, y,
+                                  rtol: float = 1e-10):
+    """
+    Checks that `submoon_system_derivative`, `submoon_system_derivative_packed` and
+    `submoon_system_derivative_ensemble` agree at the state vector `y`, since the first one and the latter two are
+    separate implementations of the same equations. Raises a ValueError if not.
+    This is a debugging helper to run by hand after changing the equations. It is not called during integrations.
+
+    :param planetary_system: List['CelestialBody'],    The system, ordered as star, planet, moon, submoon.
+    :param y: list,                                     The state vector to compare the derivatives at.
+    :param rtol: float,                                 (Optional) The relative tolerance.
+    """
+    reference = np.array(submoon_system_derivative(0, y, planetary_system, mu_m_sm, mu_p_m, mu_s_p), dtype=float)
+    packed = submoon_system_derivative_packed(0, y, pack_rhs_parameters(planetary_system, mu_m_sm, mu_p_m, mu_s_p))
+    ensemble = submoon_system_derivative_ensemble(
+        0, y, pack_rhs_parameters_ensemble(BodyEnsemble.from_celestial_bodies(planetary_system)))
+    for name, derivative in [("packed", packed), ("ensemble", ensemble)]:
+        if not np.allclose(derivative, reference, rtol=rtol, atol=0):
+            raise ValueError(f"The {name} derivative {derivative} deviates from the one calculated by "
+                             f"`submoon_system_derivative`, {reference}.")
+
+
 def semi_major_axes_analytical_solution(t: float, y0: np.array , planetary_system: List['CelestialBody'], list_of_mus):
     """
     Calculates an analytic solution of the semi-major-axes evolutions of submoon, moon and planet, assuming
@@ -2053,11 +2512,15 @@ def solve_ivp_iterator(n_pix_planet: int, n_pix_moon: int, n_pix_submoon: int, y
                 # Unpack standard gravitational parameters
                 mu_m_sm, mu_p_m, mu_s_p = list_of_std_mus
 
+                # Pack the bodies' properties once, such that the derivative only operates on arrays
+                rhs_params = pack_rhs_parameters(planetary_system, mu_m_sm, mu_p_m, mu_s_p)
+
                 # Solve the problem
                 # noinspection PyTupleAssignmentBalance
                 tracker.clear()
                 sol_object = solve_ivp(
-                    fun=submoon_system_derivative,
+                    # `args` are meant for the events, the packed derivative only needs `rhs_params`
+                    fun=lambda t, y, *_: submoon_system_derivative_packed(t, y, rhs_params),
                     t_span=(0, final_time),
                     y0=y_init, method="Radau",
                     args=(planetary_system, mu_m_sm, mu_p_m, mu_s_p),